@@ -7,6 +7,14 @@ import xarray as xr
 from pvxarray import points, rectilinear, structured
 from pvxarray.vtk_source import PyVistaXarraySource
 
+try:
+    import dask.array as dask_array
+    from dask.base import get_scheduler
+    from dask.local import get_sync
+    from dask.threaded import get as get_threaded
+except ImportError:  # dask is optional
+    dask_array = None
+
 methods = {
     "points": points.mesh,
     "rectilinear": rectilinear.mesh,
@@ -41,7 +49,7 @@ class PyVistaAccessor:
 
     def _get_array(self, key, scale=1):
         try:
-            values = self._obj[key].values
+            values = self._obj[key].pyvista.data
             if "float" not in str(values.dtype) and "int" not in str(values.dtype):
                 # non-numeric coordinate, assign array of scaled indices
                 values = np.array(range(len(values))) * scale
@@ -53,6 +61,18 @@ class PyVistaAccessor:
 
     @property
     def data(self):
+        if self._obj.chunks is not None and dask_array is not None:
+            data = self._obj.data
+            # Stream chunks into a single preallocated buffer rather than
+            # computing and concatenating them into an intermediate copy.
+            # Only schedulers running in this process can write into it.
+            if isinstance(data, dask_array.Array) and get_scheduler(collections=[data]) in (
+                get_threaded,
+                get_sync,
+            ):
+                out = np.empty(data.shape, dtype=data.dtype)
+                dask_array.store(data, out, lock=False)
+                return out
         return self._obj.values
 
     def mesh(
@@ -112,6 +132,8 @@ class PyVistaAccessor:
         component: Optional[str] = None,
         mesh_type: Optional[str] = None,
         resolution: float = 1.0,
+        scheduler: Optional[str] = None,
+        precision: Optional[str] = None,
     ):
         return PyVistaXarraySource(
             data_array=self._obj,
@@ -123,4 +145,6 @@ class PyVistaAccessor:
             component=component,
             mesh_type=mesh_type,
             resolution=resolution,
+            scheduler=scheduler,
+            precision=precision,
         )
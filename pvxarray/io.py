@@ -13,6 +13,8 @@ try:
 except ImportError:  # pyvista<0.40
     from pyvista import UniformGrid as ImageData
 
+_EXTENSIONS = frozenset({".vti", ".vtr", ".vts", ".vtk"})
+
 
 def rectilinear_grid_to_dataset(mesh):
     dims = list(mesh.dimensions)
@@ -31,11 +33,13 @@ def rectilinear_grid_to_dataset(mesh):
 
 
 def image_data_to_dataset(mesh):
+    extent = mesh.GetExtent()
+
     def gen_coords(i):
-        coords = (
-            np.cumsum(np.insert(np.full(mesh.dimensions[i] - 1, mesh.spacing[i]), 0, 0))
-            + mesh.origin[i]  # noqa: W503
-        )
+        # Point indices start at the extent's lower bound, not at the origin
+        coords = np.arange(extent[2 * i], extent[2 * i + 1] + 1, dtype=float)
+        coords *= mesh.spacing[i]
+        coords += mesh.origin[i]
         return coords
 
     dims = list(mesh.dimensions)
@@ -113,8 +117,7 @@ class PyVistaBackendEntrypoint(BackendEntrypoint):
     ]
 
     def guess_can_open(self, filename_or_obj):
-        try:
-            _, ext = os.path.splitext(filename_or_obj)
-        except TypeError:
+        if not isinstance(filename_or_obj, (str, os.PathLike)):
             return False
-        return ext in {".vti", ".vtr", ".vts", ".vtk"}
+        _, ext = os.path.splitext(filename_or_obj)
+        return ext.lower() in _EXTENSIONS
@@ -36,7 +36,7 @@ def mesh(
         # Assuming additional component array
         dims = set(self._obj.dims)
         dims.discard(component)
-        values = self._obj.transpose(*dims, component, transpose_coords=True).values
+        values = self._obj.transpose(*dims, component, transpose_coords=True).pyvista.data
         values = values.reshape((-1, values.shape[-1]), order=order)
         warnings.warn(
             DataCopyWarning(
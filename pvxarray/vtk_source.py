@@ -1,25 +1,50 @@
-import traceback
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import logging
 from typing import List, Optional
+import weakref
 
 import numpy as np
 import pyvista as pv
 from vtkmodules.util.vtkAlgorithm import VTKPythonAlgorithmBase
+from vtkmodules.vtkCommonDataModel import vtkDataObject
 import xarray as xr
 
+logger = logging.getLogger(__name__)
+
+_OUTPUT_TYPES = {
+    "points": "vtkPolyData",
+    "rectilinear": "vtkRectilinearGrid",
+    "structured": "vtkStructuredGrid",
+}
+
+
+def _check_precision(precision):
+    if precision not in (None, "single"):
+        raise ValueError(f"Unsupported precision {precision!r}, must be None or 'single'.")
+
 
 class BaseSource(VTKPythonAlgorithmBase):
     def __init__(self, nOutputPorts=1, outputType="vtkTable", **kwargs):
         VTKPythonAlgorithmBase.__init__(
             self, nInputPorts=0, nOutputPorts=nOutputPorts, outputType=outputType, **kwargs
         )
+        self._output_cache = {}
 
     def GetOutput(self, port=0):
-        output = pv.wrap(self.GetOutputDataObject(port))
+        data = self.GetOutputDataObject(port)
+        # Reuse the wrapped output until the pipeline produces new data
+        key = (data, data.GetMTime())
+        cached = self._output_cache.get(port)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        output = pv.wrap(data)
         if output.active_scalars is None and output.n_arrays:
             if len(output.point_data):
                 output.set_active_scalars(output.point_data.keys()[0])
             elif len(output.cell_data):
                 output.set_active_scalars(output.cell_data.keys()[0])
+        self._output_cache[port] = (key, output)
         return output
 
     def apply(self):
@@ -47,14 +72,19 @@ class PyVistaXarraySource(BaseSource):
         component: Optional[str] = None,
         mesh_type: Optional[str] = None,
         resolution: Optional[float] = None,
+        scheduler: Optional[str] = None,
+        precision: Optional[str] = None,
     ):
         BaseSource.__init__(
             self,
             nOutputPorts=1,
-            outputType="vtkRectilinearGrid",
+            outputType=_OUTPUT_TYPES.get(mesh_type, "vtkRectilinearGrid"),
         )
         self._data_array = data_array
         self._resolution = resolution
+        self._scheduler = scheduler
+        _check_precision(precision)
+        self._precision = precision
 
         self._x = x
         self._y = y
@@ -72,13 +102,34 @@ class PyVistaXarraySource(BaseSource):
 
         self._z_index = None
         self._slicing = None
+        self._slices = {}
+        self._scales = {}
         self._sliced_data_array = None
-        self._persisted_data = None
         self._mesh = None
+        self._mesh_order = None
+        self._values_dirty = False
+        self._data_range = None
+        self._max_time_index = None
+        self._last_error = None
+        self._prefetched = {}
+        self._executor = None
 
     def __str__(self):
+        da = self._data_array
+        if da is not None:
+            # Avoid the full DataArray repr, which may compute dask previews
+            da = f"<{da.name} {dict(da.sizes)} {da.dtype}>"
+        return self._format(da)
+
+    __repr__ = __str__
+
+    def describe(self):
+        """Describe the source including the full data array repr."""
+        return self._format(self._data_array)
+
+    def _format(self, data_array):
         return f"""
-data_array: {self._data_array}
+data_array: {data_array}
 resolution: {self._resolution}
 x: {self._x}
 y: {self._y}
@@ -107,6 +158,25 @@ time_index: {self._time_index}
         self._resolution = resolution
         self.Modified()
 
+    @property
+    def scheduler(self):
+        return self._scheduler
+
+    @scheduler.setter
+    def scheduler(self, scheduler: Optional[str]):
+        # Only affects how dask evaluates the data, not the output itself
+        self._scheduler = scheduler
+
+    @property
+    def precision(self):
+        return self._precision
+
+    @precision.setter
+    def precision(self, precision: Optional[str]):
+        _check_precision(precision)
+        self._precision = precision
+        self.Modified()
+
     @property
     def x(self):
         return self._x
@@ -150,7 +220,7 @@ time_index: {self._time_index}
     @order.setter
     def order(self, order: str):
         self._order = order
-        self.Modified()
+        self._mesh_modified()
 
     @property
     def component(self):
@@ -159,7 +229,7 @@ time_index: {self._time_index}
     @component.setter
     def component(self, component: str):
         self._component = component
-        self.Modified()
+        self._mesh_modified()
 
     @property
     def time_index(self):
@@ -168,12 +238,19 @@ time_index: {self._time_index}
     @time_index.setter
     def time_index(self, time_index: int):
         self._time_index = time_index
-        self.Modified()
+        static = self._static_geometry()
+        self._values_modified()
+        if not static:
+            self._mesh = None
+        self._prefetch(time_index + 1)
 
     @property
     def max_time_index(self):
         if self._time:
-            return len(self.data_array[self._time]) - 1
+            # Only changes with the data array or time dimension (via Modified)
+            if self._max_time_index is None:
+                self._max_time_index = len(self.data_array[self._time]) - 1
+            return self._max_time_index
 
     @property
     def z_index(self):
@@ -191,6 +268,8 @@ time_index: {self._time_index}
     @slicing.setter
     def slicing(self, slicing: Optional[List[int]]):
         self._slicing = slicing
+        self._slices = {k: slice(*v) for k, v in slicing.items()} if slicing else {}
+        self._scales = {k: v[2] for k, v in slicing.items()} if slicing else {}
         self.Modified()
 
     @property
@@ -201,84 +280,218 @@ time_index: {self._time_index}
 
     @property
     def persisted_data(self):
-        if self._persisted_data is None:
-            self._persisted_data = self.sliced_data_array.persist()
-        return self._persisted_data
+        # Dask-backed data is left lazy and only evaluated when the mesh
+        # pulls its values, leaving scheduling decisions to the user
+        return self.sliced_data_array
 
     @property
     def mesh(self):
         if self._mesh is None:
             self._compute_mesh()
+        elif self._values_dirty:
+            self._update_mesh_values()
         return self._mesh
 
     @property
     def data_range(self):
-        da = self.persisted_data
-        return da.min(), da.max()
+        if self._data_range is None:
+            da = self.persisted_data
+            if da.chunks:
+                import dask
+
+                # Evaluate both reductions in a single pass over the chunks
+                self._data_range = dask.compute(da.min(), da.max(), scheduler=self._scheduler)
+            else:
+                self._data_range = da.min(), da.max()
+        return self._data_range
 
     def resolution_to_sampling_rate(self, data_array):
         """Convert percentage to sampling rate."""
-        shape = np.array(data_array.shape)
-        n = np.floor(shape * self._resolution)
-        rate = np.ceil(shape / n).astype(int)
-        return np.pad(rate, (0, 3 - len(rate)), mode="constant")
+        rates = self._sampling_rates(data_array.shape)
+        rates += [1] * (3 - len(rates))
+        return tuple(rates)
+
+    def _sampling_rates(self, shape):
+        rates = []
+        for s in shape:
+            n = max(1, int(s * self._resolution))
+            rates.append(max(1, -(-s // n)))  # ceil division
+        return rates
 
     def _compute_sliced_data_array(self):
         if self.data_array is None:
             self._sliced_data_array = None
             return None
 
-        indexing = {}
-        if self._slicing is not None:
-            indexing = {
-                k: slice(*v) for k, v in self._slicing.items() if k in [self.x, self.y, self.z]
-            }
+        future = self._prefetched.get(self._time_index)
+        if future is not None:
+            self._sliced_data_array = future.result()
+        else:
+            self._sliced_data_array = self._slice(self._time_index)
+        return self._sliced_data_array
+
+    def _slice(self, time_index):
+        da = self.data_array
+        spatial = (self.x, self.y, self.z)
+        indexing = {k: s for k, s in self._slices.items() if k and k in spatial}
 
         if self._time is not None:
-            indexing.update(**{self._time: self.time_index})
+            indexing[self._time] = time_index
 
         if self.z and self.z_index is not None:
-            indexing.update(**{self.z: self.z_index})
-
-        da = self.data_array.isel(indexing)
+            indexing[self.z] = self.z_index
+
+        if self._resolution is not None and self._resolution < 1:
+            # Fold the level of detail strides into the same indexer so
+            # the data is only indexed once
+            dims = [d for d in da.dims if isinstance(indexing.get(d, slice(None)), slice)]
+            slices = [indexing.get(d, slice(None)) for d in dims]
+            shape = [len(range(*s.indices(da.sizes[d]))) for d, s in zip(dims, slices)]
+            for d, s, r in zip(dims, slices, self._sampling_rates(shape)):
+                if r > 1:
+                    indexing[d] = slice(s.start, s.stop, (s.step or 1) * r)
+
+        if indexing:
+            da = da.isel(indexing, missing_dims="ignore")
+
+        if self._precision == "single":
+            # Halve the bytes handed to VTK for double precision data
+            if da.dtype == np.float64:
+                da = da.astype(np.float32)
+            coords = {
+                c: da[c].astype(np.float32)
+                for c in spatial
+                if c in da.coords and da[c].dtype == np.float64
+            }
+            if coords:
+                da = da.assign_coords(coords)
+
+        return da
+
+    def _prefetch(self, time_index):
+        """Start loading a dask-backed time step in the background."""
+        if self._time is None or self.data_array is None or not self.data_array.chunks:
+            return
+        # Only keep the current and upcoming time steps in memory
+        self._drop_prefetched(keep=(self._time_index, time_index))
+        if time_index in self._prefetched or time_index > self.max_time_index:
+            return
+        # The lazy slice is built here so the worker never reads state
+        # that the caller may be changing
+        da = self._slice(time_index)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+            # Stop the worker once the source is garbage collected
+            weakref.finalize(self, self._executor.shutdown, wait=False, cancel_futures=True)
+        self._prefetched[time_index] = self._executor.submit(da.compute, scheduler=self._scheduler)
+
+    def _drop_prefetched(self, keep=()):
+        """Forget prefetched time steps, cancelling any not yet started."""
+        for time_index in list(self._prefetched):
+            if time_index not in keep:
+                self._prefetched.pop(time_index).cancel()
+
+    def close(self):
+        """Cancel pending prefetches and stop the background worker."""
+        self._drop_prefetched()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _scheduler_context(self):
+        if self._scheduler is None:
+            return contextlib.nullcontext()
+        import dask
+
+        return dask.config.set(scheduler=self._scheduler)
 
-        if self._slicing is None and self._resolution is not None:
-            rx, ry, rz = self.resolution_to_sampling_rate(da)
-            if da.ndim <= 1:
-                da = da[::rx]
-            elif da.ndim == 2:
-                da = da[::rx, ::ry]
-            elif da.ndim == 3:
-                da = da[::rx, ::ry, ::rz]
+    def _compute_mesh(self):
+        with self._scheduler_context():
+            self._mesh = self.persisted_data.pyvista.mesh(
+                x=self._x,
+                y=self._y,
+                z=self._z if self._z_index is None else None,
+                order=self._order,
+                component=self._component,
+                mesh_type=self._mesh_type,
+                scales=self._scales,
+            )
+        # Remember the ordering the mesh builder fell back to, so in-place
+        # value updates lay out the data the same way
+        if self._order is None:
+            self._mesh_order = "F" if isinstance(self._mesh, pv.StructuredGrid) else "C"
+        else:
+            self._mesh_order = self._order
+        self._values_dirty = False
+        return self._mesh
 
-        self._sliced_data_array = da
-        return self._sliced_data_array
+    def _static_geometry(self):
+        """Whether the mesh coordinates are independent of the time index."""
+        if self._time is None or self._mesh is None or self._component is not None:
+            return False
+        coords = [c for c in (self._x, self._y, self._z) if c is not None]
+        return not any(self._time in self.data_array[c].dims for c in coords)
 
-    def _compute_mesh(self):
-        self._mesh = self.persisted_data.pyvista.mesh(
-            x=self._x,
-            y=self._y,
-            z=self._z if self._z_index is None else None,
-            order=self._order,
-            component=self._component,
-            mesh_type=self._mesh_type,
-            scales={k: v[2] for k, v in self._slicing.items()} if self._slicing else {},
-        )
+    def _update_mesh_values(self):
+        """Refresh the data values on the existing mesh in place."""
+        da = self.persisted_data
+        with self._scheduler_context():
+            values = da.pyvista.data
+        self._mesh[da.name or "data"] = values.ravel(order=self._mesh_order)
+        self._values_dirty = False
         return self._mesh
 
+    def _mesh_modified(self):
+        """Invalidate the mesh while keeping the sliced data."""
+        self._mesh = None
+        super().Modified()
+
+    def _values_modified(self):
+        """Invalidate the sliced data while keeping the mesh geometry."""
+        self._sliced_data_array = None
+        self._data_range = None
+        self._values_dirty = True
+        super().Modified()
+
     def Modified(self, **kwargs):
         self._sliced_data_array = None
-        self._persisted_data = None
+        self._data_range = None
+        self._max_time_index = None
         self._mesh = None
+        self._drop_prefetched()
         super().Modified(**kwargs)
 
+    def RequestDataObject(self, request, inInfo, outInfo):
+        # The mesh type may be guessed from the coordinates, so make sure
+        # the output data object matches the mesh that will be generated
+        if self.data_array is None:
+            return 1
+        try:
+            mesh = self.mesh
+        except Exception:
+            # Reported by RequestData
+            return 1
+        self.OutputType = mesh.GetClassName()
+        self.GetOutputPortInformation(0).Set(vtkDataObject.DATA_TYPE_NAME(), self.OutputType)
+        output = vtkDataObject.GetData(outInfo)
+        if output is None or not output.IsA(self.OutputType):
+            output = mesh.NewInstance()
+            outInfo.GetInformationObject(0).Set(vtkDataObject.DATA_OBJECT(), output)
+        return 1
+
     def RequestData(self, request, inInfo, outInfo):
         # Use open data_array handle to fetch data at
         # desired Level of Detail
         try:
-            pdo = self.GetOutputData(outInfo, 0)
-            pdo.ShallowCopy(self.mesh)
+            mesh = self.mesh
         except Exception as e:
-            traceback.print_exc()
-            raise e
+            # Report a failure once rather than on every pipeline update
+            error = f"{type(e).__name__}: {e}"
+            if error != self._last_error:
+                self._last_error = error
+                logger.error("Failed to generate mesh: %s", error, exc_info=True)
+            return 0
+        self._last_error = None
+        pdo = self.GetOutputData(outInfo, 0)
+        pdo.ShallowCopy(mesh)
         return 1
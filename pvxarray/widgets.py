@@ -1,26 +1,78 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
+
 import ipywidgets as widgets
 import pyvista as pv
-from tqdm import tqdm
+from tqdm.auto import tqdm
 
 from pvxarray.vtk_source import PyVistaXarraySource
 
 
+def throttle(wait):
+    """Run the decorated function at most once every ``wait`` seconds.
+
+    Calls made in between are coalesced and only the most recent one runs,
+    so intermediate values still stream without a backlog building up.
+    """
+
+    def decorator(fn):
+        pending = None
+        handle = None
+
+        def flush():
+            nonlocal pending, handle
+            if pending is None:
+                handle = None
+                return
+            args, kwargs = pending
+            pending = None
+            try:
+                fn(*args, **kwargs)
+            finally:
+                # Keep flushing even if the call failed
+                handle = asyncio.get_running_loop().call_later(wait, flush)
+
+        @functools.wraps(fn)
+        def throttled(*args, **kwargs):
+            nonlocal pending, handle
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                # Nothing would ever run a deferred call without a loop
+                fn(*args, **kwargs)
+                return
+            pending = (args, kwargs)
+            if handle is None:
+                handle = loop.call_soon(flush)
+
+        return throttled
+
+    return decorator
+
+
 def time_controls(
-    engine: PyVistaXarraySource, plotter: pv.BasePlotter, continuous_update=False, step=1
+    engine: PyVistaXarraySource,
+    plotter: pv.BasePlotter,
+    continuous_update=False,
+    step=1,
+    throttle_wait=0.15,
 ):
     def update_time_index(time_index):
+        if time_index == engine.time_index:
+            return
         engine.time_index = time_index
         plotter.render()
 
+    if throttle_wait:
+        # Dragging the slider or playing fires on every tick; drop stale
+        # values so at most one time step load and render is queued
+        update_time_index = throttle(throttle_wait)(update_time_index)
+
     tmax = engine.max_time_index
 
     def set_time(change):
-        value = change["new"]
-        if value < 0:
-            value = 0
-        if value >= tmax:
-            value = tmax - 1
-        update_time_index(value)
+        update_time_index(change["new"])
 
     play = widgets.Play(
         value=engine.time_index,
@@ -36,16 +88,43 @@ def time_controls(
     return widgets.HBox([play, slider])
 
 
-def show_ui(engine: PyVistaXarraySource, plotter: pv.BasePlotter, continuous_update=False, step=1):
+def show_ui(
+    engine: PyVistaXarraySource,
+    plotter: pv.BasePlotter,
+    continuous_update=False,
+    step=1,
+    throttle_wait=0.15,
+):
     iframe = plotter.show(return_viewer=True, jupyter_kwargs={"height": "600px", "width": "99%"})
-    controls = time_controls(engine, plotter, continuous_update=continuous_update, step=step)
+    controls = time_controls(
+        engine,
+        plotter,
+        continuous_update=continuous_update,
+        step=step,
+        throttle_wait=throttle_wait,
+    )
     return widgets.VBox([iframe, controls])
 
 
 def save_movie(engine: PyVistaXarraySource, plotter: pv.BasePlotter, filename: str, **kwargs):
     plotter.open_movie(filename, **kwargs)
-    for tstep in tqdm(range(engine.max_time_index + 1)):
-        engine.time_index = tstep
-        plotter.write_frame()
-    plotter.mwriter.close()  # close out writer (internal API)
+    writer = plotter.mwriter
+    # Encode each frame on a worker thread while the next one is loaded and
+    # rendered, keeping at most one frame in flight
+    encoding = None
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        for tstep in tqdm(range(engine.max_time_index + 1), mininterval=0.5):
+            engine.time_index = tstep
+            if tstep == 0:
+                # The first frame also performs the initial render
+                plotter.write_frame()
+                continue
+            plotter.render()
+            image = plotter.image
+            if encoding is not None:
+                encoding.result()
+            encoding = executor.submit(writer.append_data, image)
+    if encoding is not None:
+        encoding.result()
+    writer.close()  # close out writer (internal API)
     return filename
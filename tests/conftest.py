@@ -1 +1,50 @@
+import dask
+import numpy as np
+import pytest
+import xarray as xr
+
 import pvxarray  # noqa: F401
+
+# Test data is small; skip thread pool startup for every dask compute
+dask.config.set(scheduler="synchronous")
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
+
+
+@pytest.fixture
+def time_series(rng):
+    return xr.DataArray(
+        rng.standard_normal((3, 4, 5)),
+        dims=["time", "lat", "lon"],
+        coords={"time": np.arange(3), "lat": np.arange(4), "lon": np.arange(5)},
+        name="data",
+    )
+
+
+@pytest.fixture(scope="session")
+def air_temperature():
+    return xr.tutorial.load_dataset("air_temperature")
+
+
+@pytest.fixture(scope="session")
+def eraint_uvz():
+    return xr.tutorial.load_dataset("eraint_uvz")
+
+
+@pytest.fixture(scope="session")
+def roms():
+    ds = xr.tutorial.open_dataset("ROMS_example.nc", chunks={"ocean_time": 1})
+
+    if ds.Vtransform == 1:
+        Zo_rho = ds.hc * (ds.s_rho - ds.Cs_r) + ds.Cs_r * ds.h
+        z_rho = Zo_rho + ds.zeta * (1 + Zo_rho / ds.h)
+    elif ds.Vtransform == 2:
+        Zo_rho = (ds.hc * ds.s_rho + ds.Cs_r * ds.h) / (ds.hc + ds.h)
+        z_rho = ds.zeta + (ds.zeta + ds.h) * Zo_rho
+
+    ds.coords["z_rho"] = z_rho.transpose()  # needing transpose seems to be an xarray bug
+
+    return ds
@@ -6,8 +6,8 @@ import pvxarray
 
 
 @pytest.fixture
-def sample():
-    temp = 15 + 8 * np.random.randn(2, 2, 2, 2)
+def sample(rng):
+    temp = 15 + 8 * rng.standard_normal((2, 2, 2, 2))
     return xr.Dataset(
         {
             "temperature": (["w", "u", "v", "t"], temp),
@@ -7,71 +7,84 @@ import scooby
 import xarray as xr
 
 from pvxarray import pyvista_to_xarray
+from pvxarray.io import PyVistaBackendEntrypoint
 
 try:
     from pyvista import ImageData
 except ImportError:  # pyvista<0.40
     from pyvista import UniformGrid as ImageData
 
+DATA_DIR = Path(__file__).parent / "data"
 
-@pytest.fixture
+
+@pytest.fixture(scope="module")
 def vtr_path():
-    return Path(Path(__file__).parent, "data", "air_temperature.vtr").absolute()
+    return DATA_DIR / "air_temperature.vtr"
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def vts_path():
-    return Path(Path(__file__).parent, "data", "structured.vts").absolute()
+    return DATA_DIR / "structured.vts"
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def vti_path():
-    return Path(Path(__file__).parent, "data", "wavelet.vti").absolute()
+    return DATA_DIR / "wavelet.vti"
 
 
-def test_engine_is_available():
-    assert "pyvista" in xr.backends.list_engines()
+@pytest.fixture(scope="module")
+def vtr_truth(vtr_path):
+    return pv.RectilinearGrid(vtr_path)
 
 
-def test_read_vtr(vtr_path):
-    ds = xr.open_dataset(vtr_path, engine="pyvista")
-    truth = pv.RectilinearGrid(vtr_path)
-    assert np.allclose(ds["air"].values.ravel(), truth["air"].ravel())
-    assert np.allclose(ds["x"].values, truth.x)
-    assert np.allclose(ds["y"].values, truth.y)
-    assert np.allclose(ds["z"].values, truth.z)
-    assert ds["air"].pyvista.mesh(x="x", y="y", z="z") == truth
+@pytest.fixture(scope="module")
+def vts_truth(vts_path):
+    return pv.StructuredGrid(vts_path)
 
 
-def test_read_vti(vti_path):
-    ds = xr.open_dataset(vti_path, engine="pyvista")
-    truth = ImageData(vti_path).cast_to_rectilinear_grid()
-    assert np.allclose(ds["RTData"].values.ravel(), truth["RTData"].ravel())
-    assert np.allclose(ds["x"].values, truth.x)
-    assert np.allclose(ds["y"].values, truth.y)
-    assert np.allclose(ds["z"].values, truth.z)
-    assert ds["RTData"].pyvista.mesh(x="x", y="y", z="z") == truth
+@pytest.fixture(scope="module")
+def vti_truth(vti_path):
+    return ImageData(vti_path)
 
 
-def test_read_vts(vts_path):
-    ds = xr.open_dataset(vts_path, engine="pyvista")
-    truth = pv.StructuredGrid(vts_path)
-    assert np.allclose(ds["Elevation"].values.ravel(), truth["Elevation"].ravel())
+def test_engine_is_available():
+    assert "pyvista" in xr.backends.list_engines()
+
+
+def test_guess_can_open(vtr_path):
+    entrypoint = PyVistaBackendEntrypoint()
+    assert entrypoint.guess_can_open(vtr_path)
+    assert entrypoint.guess_can_open("mesh.VTS")
+    assert not entrypoint.guess_can_open("data.nc")
+    assert not entrypoint.guess_can_open(123)
+
+
+@pytest.mark.parametrize(
+    "path, truth, name",
+    [
+        ("vtr_path", "vtr_truth", "air"),
+        ("vti_path", "vti_truth", "RTData"),
+        ("vts_path", "vts_truth", "Elevation"),
+    ],
+)
+def test_read(request, path, truth, name):
+    ds = xr.open_dataset(request.getfixturevalue(path), engine="pyvista")
+    truth = request.getfixturevalue(truth)
+    if isinstance(truth, ImageData):
+        truth = truth.cast_to_rectilinear_grid()
+    assert np.allclose(ds[name].values.ravel(), truth[name].ravel())
     assert np.allclose(ds["x"].values, truth.x)
     assert np.allclose(ds["y"].values, truth.y)
     assert np.allclose(ds["z"].values, truth.z)
-    assert ds["Elevation"].pyvista.mesh(x="x", y="y", z="z") == truth
+    assert ds[name].pyvista.mesh(x="x", y="y", z="z") == truth
 
 
-def test_convert_vtr(vtr_path):
-    truth = pv.RectilinearGrid(vtr_path)
+def test_convert_vtr(vtr_truth):
+    truth = vtr_truth
     ds = pyvista_to_xarray(truth)
     mesh = ds["air"].pyvista.mesh(x="x", y="y", z="z")
-    assert np.array_equal(ds["air"].values.ravel(), truth["air"].ravel())
+    np.testing.assert_array_equal(ds["air"].values.ravel(), truth["air"].ravel())
     assert np.may_share_memory(ds["air"].values.ravel(), truth["air"].ravel())
-    assert np.array_equal(mesh.x, truth.x)
-    assert np.array_equal(mesh.y, truth.y)
-    assert np.array_equal(mesh.z, truth.z)
     assert np.may_share_memory(mesh.z, truth.z)
     assert mesh == truth
 
@@ -82,26 +95,32 @@ def test_convert_vtr(vtr_path):
         assert np.may_share_memory(mesh.y, truth.y)
 
 
-def test_convert_vti(vti_path):
-    truth = ImageData(vti_path)
+def test_convert_vti(vti_truth):
+    truth = vti_truth
     truth_r = truth.cast_to_rectilinear_grid()
     ds = pyvista_to_xarray(truth)
     mesh = ds["RTData"].pyvista.mesh(x="x", y="y", z="z")
-    assert np.array_equal(ds["RTData"].values.ravel(), truth["RTData"].ravel())
+    np.testing.assert_array_equal(ds["RTData"].values.ravel(), truth["RTData"].ravel())
     assert np.may_share_memory(ds["RTData"].values.ravel(), truth["RTData"].ravel())
-    assert np.array_equal(mesh.x, truth_r.x)
-    assert np.array_equal(mesh.y, truth_r.y)
-    assert np.array_equal(mesh.z, truth_r.z)
     assert mesh == truth_r
 
 
-def test_convert_vts(vts_path):
-    truth = pv.StructuredGrid(vts_path)
+def test_convert_vts(vts_truth):
+    truth = vts_truth
     ds = pyvista_to_xarray(truth)
-    assert np.array_equal(ds["Elevation"].values.ravel(), truth["Elevation"].ravel())
+    np.testing.assert_array_equal(ds["Elevation"].values.ravel(), truth["Elevation"].ravel())
     assert np.may_share_memory(ds["Elevation"].values.ravel(), truth["Elevation"].ravel())
     mesh = ds["Elevation"].pyvista.mesh(x="x", y="y", z="z")
-    assert np.array_equal(mesh.x, truth.x)
-    assert np.array_equal(mesh.y, truth.y)
-    assert np.array_equal(mesh.z, truth.z)
     assert mesh == truth
+
+
+def test_convert_vti_nonzero_extent():
+    truth = ImageData(spacing=(0.5, 2.0, 1.0), origin=(1.0, -2.0, 3.0))
+    truth.SetExtent(2, 4, -3, 0, 1, 5)
+    truth["data"] = np.arange(truth.n_points, dtype=float)
+    ds = pyvista_to_xarray(truth)
+    truth_r = truth.cast_to_rectilinear_grid()
+    np.testing.assert_array_equal(ds["x"].values, [2.0, 2.5, 3.0])
+    assert np.allclose(ds["x"].values, truth_r.x)
+    assert np.allclose(ds["y"].values, truth_r.y)
+    assert np.allclose(ds["z"].values, truth_r.z)
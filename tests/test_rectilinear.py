@@ -1,5 +1,6 @@
 from pathlib import Path
 
+import dask
 import numpy as np
 import pytest
 import rioxarray
@@ -7,13 +8,15 @@ import xarray as xr
 
 from pvxarray import DataCopyWarning
 
+DATA_DIR = Path(__file__).parent / "data"
+
 
 @pytest.fixture
-def simple():
+def simple(rng):
     lon = np.array([-99.83, -99.32])
     lat = np.array([42.25, 42.21])
     z = np.array([0, 10])
-    temp = 15 + 8 * np.random.randn(2, 2, 2)
+    temp = 15 + 8 * rng.standard_normal((2, 2, 2))
     ds = xr.Dataset(
         {
             "temperature": (["z", "x", "y"], temp),
@@ -24,12 +27,17 @@ def simple():
             "z": (["z"], z),
         },
     )
-    return {"lon": lon, "lat": lat, "z": z, "temp": temp, "ds": ds}
+    return {"lon": lon, "lat": lat, "z": z, "temp": temp, "temp_flat": temp.ravel(), "ds": ds}
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def bahamas_rgb():
-    return Path(Path(__file__).parent, "data", "bahamas_rgb.tif").absolute()
+    return DATA_DIR / "bahamas_rgb.tif"
+
+
+@pytest.fixture(scope="module")
+def bahamas_rgb_da(bahamas_rgb):
+    return rioxarray.open_rasterio(bahamas_rgb).load()
 
 
 def test_simple(simple):
@@ -39,7 +47,7 @@ def test_simple(simple):
     assert np.array_equal(mesh.x, simple["lon"])
     assert np.array_equal(mesh.y, simple["lat"])
     assert np.array_equal(mesh.z, simple["z"])
-    assert np.array_equal(mesh["temperature"], simple["temp"].ravel())
+    assert np.array_equal(mesh["temperature"], simple["temp_flat"])
 
 
 def test_shared_coords(simple):
@@ -65,31 +73,30 @@ def test_shared_data(simple):
     mesh = simple["ds"].temperature.pyvista.mesh(x="lon", y="lat", z="z")
 
     mesh["temperature"][0] = -1
-    assert simple["temp"].ravel()[0] == -1
-    assert np.array_equal(mesh["temperature"], simple["temp"].ravel())
-    assert np.may_share_memory(mesh["temperature"], simple["temp"].ravel())
+    assert simple["temp_flat"][0] == -1
+    assert np.array_equal(mesh["temperature"], simple["temp_flat"])
+    assert np.may_share_memory(mesh["temperature"], simple["temp_flat"])
 
 
-def test_air_temperature():
-    ds = xr.tutorial.load_dataset("air_temperature")
-    da = ds.air[dict(time=0)]
+def test_air_temperature(air_temperature):
+    da = air_temperature.air[dict(time=0)]
 
     mesh = da.pyvista.mesh(x="lon", y="lat")
     assert mesh
     assert mesh.n_points == 1325
     assert "air" in mesh.point_data
 
-    assert np.array_equal(mesh["air"], da.values.ravel())
+    np.testing.assert_array_equal(mesh["air"], da.values.ravel())
     assert np.may_share_memory(mesh["air"], da.values.ravel())
-    assert np.array_equal(mesh.x, da.lon)
+    np.testing.assert_array_equal(mesh.x, da.lon)
     # TODO: why `may_share_memory` failing here?
     # assert np.may_share_memory(mesh.x, da.lon)
-    assert np.array_equal(mesh.y, da.lat)
+    np.testing.assert_array_equal(mesh.y, da.lat)
     # assert np.may_share_memory(mesh.y, da.lat)
 
 
-def test_rioxarray(bahamas_rgb):
-    da = rioxarray.open_rasterio(bahamas_rgb)
+def test_rioxarray(bahamas_rgb_da):
+    da = bahamas_rgb_da
     band = da[dict(band=1)]
     mesh = band.pyvista.mesh(x="x", y="y")
     assert np.array_equal(mesh["data"], band.values.ravel())
@@ -101,8 +108,8 @@ def test_rioxarray(bahamas_rgb):
 
 
 @pytest.mark.xfail(strict=False)
-def test_rioxarray_multicomponent(bahamas_rgb):
-    da = rioxarray.open_rasterio(bahamas_rgb)
+def test_rioxarray_multicomponent(bahamas_rgb_da):
+    da = bahamas_rgb_da
     with pytest.warns(DataCopyWarning):
         mesh = da.pyvista.mesh(x="x", y="y", component="band")
     assert np.array_equal(mesh.x, da.x.values)
@@ -110,7 +117,7 @@ def test_rioxarray_multicomponent(bahamas_rgb):
     assert np.array_equal(mesh.y, da.y.values)
     assert np.may_share_memory(mesh.y, da.y.values)
     # Check multicomponent array
-    values = da.values.swapaxes(0, 2).swapaxes(0, 1).reshape(-1, 3)
+    values = np.moveaxis(da.values, 0, -1).reshape(-1, 3)
     assert np.allclose(mesh["data"], values)  # TODO: this check is flaky which is very concerning
 
 
@@ -121,16 +128,16 @@ def test_too_few_dimensions(simple):
         simple["ds"].temperature.pyvista.mesh(x="x", y="y")
 
 
-def test_too_many_dimensions(bahamas_rgb):
-    da = rioxarray.open_rasterio(bahamas_rgb)
+def test_too_many_dimensions(bahamas_rgb_da):
+    da = bahamas_rgb_da
     band = da[dict(band=1)]
     with pytest.raises(ValueError):
         band.pyvista.mesh(x="x", y="y", z="band")
 
 
-def test_1D_rectilinear_x():
+def test_1D_rectilinear_x(rng):
     lon = np.array([-99.83, -99.32, -99.11])
-    temp = 15 + 8 * np.random.randn(3)
+    temp = 15 + 8 * rng.standard_normal(3)
     ds = xr.Dataset(
         {
             "temperature": (["x"], temp),
@@ -147,9 +154,9 @@ def test_1D_rectilinear_x():
     assert np.may_share_memory(mesh["temperature"], temp)
 
 
-def test_1D_rectilinear_y():
+def test_1D_rectilinear_y(rng):
     lat = np.array([42.25, 42.21, 42.18])
-    temp = 15 + 8 * np.random.randn(3)
+    temp = 15 + 8 * rng.standard_normal(3)
     ds = xr.Dataset(
         {
             "temperature": (["y"], temp),
@@ -166,10 +173,10 @@ def test_1D_rectilinear_y():
     assert np.may_share_memory(mesh["temperature"], temp)
 
 
-def test_2D_rectilinear_yz():
+def test_2D_rectilinear_yz(rng):
     lat = np.array([42.25, 42.21])
     z = np.array([0, 10])
-    temp = 15 + 8 * np.random.randn(2, 2)
+    temp = 15 + 8 * rng.standard_normal((2, 2))
     ds = xr.Dataset(
         {
             "temperature": (["z", "y"], temp),
@@ -187,3 +194,27 @@ def test_2D_rectilinear_yz():
     assert np.may_share_memory(mesh.z, z)
     assert np.array_equal(mesh["temperature"], temp.ravel())
     assert np.may_share_memory(mesh["temperature"], temp)
+
+
+def test_dask_backed(simple):
+    da = simple["ds"].temperature.chunk({"z": 1})
+    mesh = da.pyvista.mesh(x="lon", y="lat", z="z")
+    assert mesh.n_points == 8
+    assert np.array_equal(mesh.x, simple["lon"])
+    assert np.array_equal(mesh["temperature"], simple["temp_flat"])
+
+
+def test_dask_backed_threaded_scheduler(simple):
+    # The default scheduler writes chunks straight into the output buffer
+    da = simple["ds"].temperature.chunk({"z": 1})
+    with dask.config.set(scheduler="threads"):
+        mesh = da.pyvista.mesh(x="lon", y="lat", z="z")
+    assert np.array_equal(mesh["temperature"], simple["temp_flat"])
+
+
+def test_dask_backed_processes_scheduler(simple):
+    # Worker processes cannot write into a buffer allocated here
+    da = simple["ds"].temperature.chunk({"z": 1})
+    with dask.config.set(scheduler="processes"):
+        mesh = da.pyvista.mesh(x="lon", y="lat", z="z")
+    assert np.array_equal(mesh["temperature"], simple["temp_flat"])
@@ -1,13 +1,14 @@
 import numpy as np
+import pytest
+import pyvista as pv
 import xarray as xr
 
 from pvxarray.vtk_source import PyVistaXarraySource
 
 
-def test_vtk_source():
-    ds = xr.tutorial.load_dataset("air_temperature")
-
-    da = ds.air
+def test_vtk_source(air_temperature):
+    da = air_temperature.air
+    expected = [da[dict(time=t)].values.ravel() for t in range(2)]
     source = PyVistaXarraySource(da, x="lon", y="lat", time="time", resolution=1.0)
 
     mesh = source.apply()
@@ -15,25 +16,23 @@ def test_vtk_source():
     assert mesh.n_points == 1325
     assert "air" in mesh.point_data
 
-    assert np.array_equal(mesh["air"], da[dict(time=0)].values.ravel())
-    # assert np.may_share_memory(mesh["air"], da[dict(time=0)].values.ravel())
+    assert np.array_equal(mesh["air"], expected[0])
+    # assert np.may_share_memory(mesh["air"], expected[0])
     assert np.array_equal(mesh.x, da.lon)
     assert np.array_equal(mesh.y, da.lat)
 
     source.time_index = 1
     mesh = source.apply()
-    assert np.array_equal(mesh["air"], da[dict(time=1)].values.ravel())
-    # assert np.may_share_memory(mesh["air"], da[dict(time=1)].values.ravel())
+    assert np.array_equal(mesh["air"], expected[1])
+    # assert np.may_share_memory(mesh["air"], expected[1])
 
     source.resolution = 0.5
     mesh = source.apply()
     assert mesh.n_points < 1325
 
 
-def test_vtk_source_time_as_spatial():
-    ds = xr.tutorial.load_dataset("air_temperature")
-
-    da = ds.air
+def test_vtk_source_time_as_spatial(air_temperature):
+    da = air_temperature.air
     source = PyVistaXarraySource(da, x="lon", y="lat", z="time")
 
     mesh = source.apply()
@@ -45,13 +44,11 @@ def test_vtk_source_time_as_spatial():
     assert np.array_equal(mesh.x, da.lon)
     assert np.array_equal(mesh.y, da.lat)
     # Z values are indexes instead of datetime objects
-    assert np.array_equal(mesh.z, list(range(da.time.size)))
-
+    assert np.array_equal(mesh.z, np.arange(da.time.size))
 
-def test_vtk_source_slicing():
-    ds = xr.tutorial.load_dataset("eraint_uvz")
 
-    da = ds.z
+def test_vtk_source_slicing(eraint_uvz):
+    da = eraint_uvz.z
     source = PyVistaXarraySource(
         da,
         x="longitude",
@@ -69,3 +66,209 @@ def test_vtk_source_slicing():
 
     sliced = source.sliced_data_array
     assert sliced.shape == (3, 121, 120)
+
+
+def test_vtk_source_resolution(rng):
+    da = xr.DataArray(
+        rng.standard_normal((10, 20)),
+        dims=["lat", "lon"],
+        coords={"lat": np.arange(10), "lon": np.arange(20)},
+        name="data",
+    )
+    source = PyVistaXarraySource(da, x="lon", y="lat", resolution=0.5)
+    assert source.sliced_data_array.shape == (5, 10)
+    mesh = source.apply()
+    assert mesh.n_points == 50
+    assert np.array_equal(mesh["data"], da[::2, ::2].values.ravel())
+
+    source.resolution = 1.0
+    assert source.sliced_data_array.shape == (10, 20)
+
+
+def test_resolution_to_sampling_rate():
+    da = xr.DataArray(np.zeros((10, 20)), dims=["lat", "lon"])
+    source = PyVistaXarraySource(da, x="lon", y="lat", resolution=0.5)
+    assert source.resolution_to_sampling_rate(da) == (2, 2, 1)
+    # Resolutions too small to keep a full sample fall back to one point
+    source.resolution = 0.01
+    assert source.resolution_to_sampling_rate(da) == (10, 20, 1)
+
+
+def test_vtk_source_data_range():
+    da = xr.DataArray(np.arange(24.0).reshape(4, 6), dims=["lat", "lon"], name="data")
+    source = PyVistaXarraySource(da, x="lon", y="lat")
+    dmin, dmax = source.data_range
+    assert dmin == 0
+    assert dmax == 23
+
+    assert source.data_range is source.data_range
+
+    source.data_array = da.chunk({"lat": 2}) + 1
+    dmin, dmax = source.data_range
+    assert dmin == 1
+    assert dmax == 24
+
+
+def test_vtk_source_time_step_reuses_geometry(time_series):
+    da = time_series
+    source = PyVistaXarraySource(da, x="lon", y="lat", time="time")
+    mesh = source.mesh
+    assert np.array_equal(source.apply()["data"], da[dict(time=0)].values.ravel())
+
+    source.time_index = 2
+    assert source.mesh is mesh
+    assert np.array_equal(source.apply()["data"], da[dict(time=2)].values.ravel())
+
+    # Coordinates varying in time require rebuilding the mesh
+    source.data_array = da.assign_coords(height=da.time * da.lat)
+    source.z = "height"
+    source.y = None
+    mesh = source.mesh
+    source.time_index = 1
+    assert source.mesh is not mesh
+
+
+def test_vtk_source_structured_time_step(rng):
+    lon, lat = np.meshgrid(np.arange(5.0), np.arange(4.0))
+    da = xr.DataArray(
+        rng.standard_normal((3, 4, 5)),
+        dims=["time", "yi", "xi"],
+        coords={"time": np.arange(3), "lon": (["yi", "xi"], lon), "lat": (["yi", "xi"], lat)},
+        name="data",
+    )
+    # Without an explicit order the structured builder falls back to "F"
+    source = PyVistaXarraySource(da, x="lon", y="lat", time="time", order=None)
+    mesh = source.apply()
+    assert isinstance(mesh, pv.StructuredGrid)
+
+    source.time_index = 1
+    mesh = source.apply()
+    expected = da[dict(time=1)].pyvista.mesh(x="lon", y="lat")
+    assert np.array_equal(mesh["data"], expected["data"])
+
+
+def test_vtk_source_dask_scheduler(time_series):
+    da = time_series.chunk({"time": 1})
+    source = da.pyvista.algorithm(x="lon", y="lat", time="time", scheduler="processes")
+    assert source.persisted_data.chunks
+    mesh = source.apply()
+    assert np.array_equal(mesh["data"], da[dict(time=0)].values.ravel())
+    source.time_index = 1
+    mesh = source.apply()
+    assert np.array_equal(mesh["data"], da[dict(time=1)].values.ravel())
+
+
+def test_vtk_source_slicing_with_resolution(rng):
+    da = xr.DataArray(
+        rng.standard_normal((2, 20, 40)),
+        dims=["time", "lat", "lon"],
+        coords={"time": np.arange(2), "lat": np.arange(20), "lon": np.arange(40)},
+        name="data",
+    )
+    source = PyVistaXarraySource(da, x="lon", y="lat", time="time", resolution=0.5)
+    source.time_index = 1
+    source.slicing = {"lat": [0, 20, 1], "lon": [0, 40, 2]}
+    sliced = source.sliced_data_array
+    assert sliced.shape == (10, 10)
+    assert np.array_equal(sliced.values, da[1, ::2, ::4].values)
+
+
+def test_vtk_source_structured_output(rng):
+    lon, lat = np.meshgrid(np.arange(5.0), np.arange(4.0))
+    da = xr.DataArray(
+        rng.standard_normal((4, 5)),
+        dims=["yi", "xi"],
+        coords={"lon": (["yi", "xi"], lon), "lat": (["yi", "xi"], lat)},
+        name="data",
+    )
+    source = PyVistaXarraySource(da, x="lon", y="lat")
+    mesh = source.apply()
+    assert isinstance(mesh, pv.StructuredGrid)
+    assert mesh.n_points == 20
+
+
+def test_vtk_source_single_precision(rng):
+    da = xr.DataArray(
+        rng.standard_normal((4, 5)),
+        dims=["lat", "lon"],
+        coords={"lat": np.arange(4.0), "lon": np.arange(5.0)},
+        name="data",
+    )
+    source = PyVistaXarraySource(da, x="lon", y="lat")
+    assert source.apply()["data"].dtype == np.float64
+
+    source.precision = "single"
+    mesh = source.apply()
+    assert mesh["data"].dtype == np.float32
+    assert mesh.x.dtype == np.float32
+    assert np.allclose(mesh["data"], da.values.ravel())
+
+    with pytest.raises(ValueError):
+        source.precision = "half"
+
+
+def test_vtk_source_error_logged_once(caplog, rng):
+    da = xr.DataArray(rng.standard_normal((4, 5)), dims=["lat", "lon"], name="data")
+    source = PyVistaXarraySource(da, x="foo", y="lat")
+    source.Update()
+    source.Modified()
+    source.Update()
+    errors = [r for r in caplog.records if r.name == "pvxarray.vtk_source"]
+    assert len(errors) == 1
+    assert "foo" in errors[0].getMessage()
+
+
+def test_vtk_source_order_keeps_sliced_data(rng):
+    da = xr.DataArray(rng.standard_normal((4, 5)), dims=["lat", "lon"], name="data")
+    source = PyVistaXarraySource(da, x="lon", y="lat")
+    mesh = source.apply()
+    sliced = source.sliced_data_array
+    source.order = "F"
+    assert source.sliced_data_array is sliced
+    assert source.mesh is not mesh
+    assert np.array_equal(source.apply()["data"], da.values.ravel(order="F"))
+
+
+def test_vtk_source_prefetch_next_time_step(time_series):
+    da = time_series.chunk({"time": 1})
+    source = PyVistaXarraySource(da, x="lon", y="lat", time="time")
+    source.time_index = 0
+    assert source.sliced_data_array.chunks
+    # Later time steps were loaded in the background
+    source.time_index = 1
+    assert not source.sliced_data_array.chunks
+    mesh = source.apply()
+    assert np.array_equal(mesh["data"], da[dict(time=1)].values.ravel())
+    source.time_index = 2
+    assert not source.sliced_data_array.chunks
+    mesh = source.apply()
+    assert np.array_equal(mesh["data"], da[dict(time=2)].values.ravel())
+
+    # Closing drops pending prefetches
+    source.time_index = 1
+    source.close()
+    source.time_index = 2
+    assert source.sliced_data_array.chunks
+    mesh = source.apply()
+    assert np.array_equal(mesh["data"], da[dict(time=2)].values.ravel())
+    source.close()
+
+
+def test_vtk_source_str():
+    da = xr.DataArray(np.zeros((4, 5)), dims=["lat", "lon"], name="air")
+    source = PyVistaXarraySource(da, x="lon", y="lat")
+    assert "<air {'lat': 4, 'lon': 5} float64>" in str(source)
+    assert repr(source) == str(source)
+    assert "xarray.DataArray" in source.describe()
+    assert "data_array: None" in str(PyVistaXarraySource())
+
+
+def test_vtk_source_output_cached(time_series):
+    da = time_series
+    source = PyVistaXarraySource(da, x="lon", y="lat", time="time")
+    mesh = source.apply()
+    assert source.apply() is mesh
+    source.time_index = 1
+    mesh = source.apply()
+    assert source.apply() is mesh
+    assert np.array_equal(mesh["data"], da[dict(time=1)].values.ravel())
@@ -3,13 +3,14 @@ import pytest
 import xarray as xr
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def simple():
+    rng = np.random.default_rng(0)
     x = np.arange(-10, 10, 0.25)
     y = np.arange(-10, 10, 0.25)
     z = np.sin(np.sqrt(x**2 + y**2))
     x, y, z = np.meshgrid(x, y, z)
-    temp = 15 + 8 * np.random.randn(*x.shape)
+    temp = 15 + 8 * rng.standard_normal(x.shape)
 
     ds = xr.Dataset(
         {
@@ -25,22 +26,6 @@ def simple():
     return {"x": x, "y": y, "z": z, "temp": temp, "ds": ds}
 
 
-@pytest.fixture
-def roms():
-    ds = xr.tutorial.open_dataset("ROMS_example.nc", chunks={"ocean_time": 1})
-
-    if ds.Vtransform == 1:
-        Zo_rho = ds.hc * (ds.s_rho - ds.Cs_r) + ds.Cs_r * ds.h
-        z_rho = Zo_rho + ds.zeta * (1 + Zo_rho / ds.h)
-    elif ds.Vtransform == 2:
-        Zo_rho = (ds.hc * ds.s_rho + ds.Cs_r * ds.h) / (ds.hc + ds.h)
-        z_rho = ds.zeta + (ds.zeta + ds.h) * Zo_rho
-
-    ds.coords["z_rho"] = z_rho.transpose()  # needing transpose seems to be an xarray bug
-
-    return ds
-
-
 def test_simple(simple):
     mesh = simple["ds"].temperature.pyvista.mesh(x="x", y="y", z="z")
 
@@ -70,5 +55,5 @@ def test_roms(roms):
     # Grab StructuredGrid mesh
     mesh = da.pyvista.mesh(x="lon_rho", y="lat_rho", z="z_rho")
 
-    assert np.allclose(mesh["salt"], da.values.ravel(order="F"), equal_nan=True)
+    assert np.array_equal(mesh["salt"], da.values.ravel(order="F"), equal_nan=True)
     assert np.allclose(mesh.z, da.z_rho, equal_nan=True)
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from pvxarray.vtk_source import PyVistaXarraySource
+from pvxarray.widgets import throttle, time_controls
+
+
+class Plotter:
+    def __init__(self):
+        self.renders = 0
+
+    def render(self):
+        self.renders += 1
+
+
+@pytest.fixture
+def engine(time_series):
+    return PyVistaXarraySource(time_series, x="lon", y="lat", time="time")
+
+
+def test_throttle_coalesces():
+    calls = []
+
+    async def main():
+        throttled = throttle(0.2)(calls.append)
+        for i in range(3):
+            throttled(i)
+        await asyncio.sleep(0.01)
+        # Leading call runs with the latest value, later ones are held back
+        assert calls == [2]
+        for i in range(3, 6):
+            throttled(i)
+        await asyncio.sleep(0.01)
+        assert calls == [2]
+        await asyncio.sleep(0.4)
+        # Trailing call runs once with the latest value
+        assert calls == [2, 5]
+
+    asyncio.run(main())
+
+
+def test_throttle_recovers_from_error():
+    calls = []
+
+    def update(value):
+        calls.append(value)
+        if value == 0:
+            raise ValueError("boom")
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        loop.set_exception_handler(lambda loop, context: None)
+        throttled = throttle(0.05)(update)
+        throttled(0)
+        await asyncio.sleep(0.01)
+        assert calls == [0]
+        throttled(1)
+        throttled(2)
+        await asyncio.sleep(0.2)
+        assert calls == [0, 2]
+
+    asyncio.run(main())
+
+
+def test_throttle_without_event_loop():
+    calls = []
+    throttled = throttle(0.15)(calls.append)
+    throttled(1)
+    throttled(2)
+    assert calls == [1, 2]
+
+
+def test_time_controls(engine):
+    plotter = Plotter()
+    controls = time_controls(engine, plotter, throttle_wait=0)
+    play, slider = controls.children
+    assert play.max == slider.max == engine.max_time_index
+
+    # The last time step is reachable
+    play.value = engine.max_time_index
+    assert engine.time_index == engine.max_time_index
+    assert plotter.renders == 1
+
+
+def test_time_controls_skips_current_index(engine):
+    plotter = Plotter()
+    controls = time_controls(engine, plotter, throttle_wait=0)
+    play, _ = controls.children
+    play.value = 1
+    engine.time_index = 0
+    play.value = 0
+    assert plotter.renders == 1